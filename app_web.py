@@ -253,10 +253,10 @@ def log_habit_post():
         'context_notes': notes,
         'time_of_day': time_of_day,
         'day_of_week': day_of_week,
-        'sleep_quality': health_snapshot['sleep_quality'],
-        'stress_level': health_snapshot['stress_level'],
-        'energy_level': health_snapshot['energy_level'],
-        'health_data_source': health_snapshot['data_source'],
+        'sleep_quality': health_snapshot.sleep_quality,
+        'stress_level': health_snapshot.stress_level,
+        'energy_level': health_snapshot.energy_level,
+        'health_data_source': health_snapshot.data_source,
     }
     
     df = pd.concat([df, pd.DataFrame([new_entry])], ignore_index=True)
@@ -394,7 +394,7 @@ def recommendations():
             }
             
             # Calculate success rate based on today's sleep quality
-            today_sleep = today_health['sleep_quality']
+            today_sleep = today_health.sleep_quality
             
             # Find similar sleep quality days (±0.5 range)
             similar_sleep = df_all[
@@ -438,15 +438,15 @@ def recommendations():
                 'current_streak': stats['current_streak'],
                 'days_since_last': stats['days_since_last'],
                 'total_completions': stats['total_completions'],
-                'sleep_quality': today_health['sleep_quality'],  # TODAY's actual sleep
-                'stress_level': today_health['stress_level'],    # TODAY's actual stress
+                'sleep_quality': today_health.sleep_quality,  # TODAY's actual sleep
+                'stress_level': today_health.stress_level,    # TODAY's actual stress
                 'work_intensity': 5,  # Could add calendar integration later
                 'social_obligations_int': 0,
                 'difficulty': 5,  # Average difficulty
                 'motivation': 7,  # Average motivation
                 'streak_momentum': stats['current_streak'] * 7,
                 'gap_penalty': stats['days_since_last'] * 5,
-                'stress_workload': today_health['stress_level'] * 5
+                'stress_workload': today_health.stress_level * 5
             }
             
             prob = trainer.predict_completion_probability(features)
@@ -467,15 +467,15 @@ def recommendations():
             'current_streak': stats['current_streak'],
             'days_since_last': stats['days_since_last'],
             'total_completions': stats['total_completions'],
-            'sleep_quality': today_health['sleep_quality'],
-            'stress_level': today_health['stress_level'],
+            'sleep_quality': today_health.sleep_quality,
+            'stress_level': today_health.stress_level,
             'work_intensity': 5,
             'social_obligations_int': 0,
             'difficulty': 5,
             'motivation': 7,
             'streak_momentum': stats['current_streak'] * 7,
             'gap_penalty': stats['days_since_last'] * 5,
-            'stress_workload': today_health['stress_level'] * 5
+            'stress_workload': today_health.stress_level * 5
         }
         
         current_prob = trainer.predict_completion_probability(current_features)
@@ -534,7 +534,7 @@ def health():
         
         # Only include days that have real data
         if sleep_data:
-            snapshot = health_integration.get_comprehensive_health_snapshot(day)
+            snapshot = health_integration.get_comprehensive_health_snapshot(day).to_dict()
             snapshot['date'] = day
             snapshot['sleep_hours'] = sleep_data.get('duration_hours', 0)
             snapshot['deep_sleep_min'] = sleep_data.get('deep_sleep_minutes', 0)
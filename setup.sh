@@ -19,6 +19,13 @@ echo "Installing dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# Optional: compile the health scoring helpers (falls back to pure Python)
+if python -c "import Cython" 2>/dev/null; then
+    echo ""
+    echo "Building compiled health scorers..."
+    cythonize -i src/_health_scores.pyx || echo "  ⚠️  Build failed, using pure-Python scorers"
+fi
+
 echo ""
 echo "=================================="
 echo "  ✅ Setup Complete!"
@@ -0,0 +1,67 @@
+# cython: language_level=3
+"""Compiled Apple Health scoring helpers
+
+C versions of the per-sample scorers in src/apple_health.py, used by
+the ML backfill path. Build in place with:
+
+    cythonize -i src/_health_scores.pyx
+
+apple_health.py falls back to its pure-Python scorers when this
+extension has not been built. Thresholds must stay in sync with the
+constants at the top of apple_health.py.
+"""
+
+cdef double SCORE_MIN = 1.0
+cdef double SCORE_MAX = 10.0
+
+cdef double SLEEP_POOR_LO = 5.0
+cdef double SLEEP_FAIR_LO = 6.0
+cdef double SLEEP_OPTIMAL_LO = 7.0
+cdef double SLEEP_OPTIMAL_HI = 9.0
+
+cdef double ENERGY_OPTIMAL_LO = 200.0
+cdef double ENERGY_OPTIMAL_HI = 500.0
+cdef double ENERGY_HEAVY = 800.0
+
+cdef double HRV_DIVISOR = 10.0
+cdef double RESTING_HR_BASELINE = 50.0
+cdef double RESTING_HR_DIVISOR = 5.0
+
+
+cpdef double sleep_quality_from_hours(double hours) noexcept nogil:
+    """Convert sleep hours to quality score"""
+    if SLEEP_OPTIMAL_LO <= hours <= SLEEP_OPTIMAL_HI:
+        return 9.0
+    elif SLEEP_FAIR_LO <= hours < SLEEP_OPTIMAL_LO:
+        return 7.0
+    elif SLEEP_POOR_LO <= hours < SLEEP_FAIR_LO:
+        return 5.0
+    elif hours < SLEEP_POOR_LO:
+        return 3.0
+    return 6.0  # >9 hours
+
+
+cpdef double energy_from_activity(double active_energy) noexcept nogil:
+    """Calculate energy level from activity calories"""
+    if ENERGY_OPTIMAL_LO <= active_energy <= ENERGY_OPTIMAL_HI:
+        return 8.0
+    elif active_energy > ENERGY_HEAVY:
+        return 5.0
+    return 7.0
+
+
+cpdef double stress_from_hrv(double hrv, double resting_hr) noexcept nogil:
+    """Calculate stress score from HRV and HR"""
+    # Clamps are written so NaN lands on the same bound as Python's
+    # min(10, max(1, x)): NaN HRV scores 1, a NaN result scores 10
+    cdef double hrv_score = hrv / HRV_DIVISOR
+    if not hrv_score > SCORE_MIN:
+        hrv_score = SCORE_MIN
+    elif hrv_score > SCORE_MAX:
+        hrv_score = SCORE_MAX
+    cdef double stress = SCORE_MAX - (hrv_score + (SCORE_MAX - (resting_hr - RESTING_HR_BASELINE) / RESTING_HR_DIVISOR)) / 2
+    if not stress < SCORE_MAX:
+        return SCORE_MAX
+    elif stress < SCORE_MIN:
+        return SCORE_MIN
+    return stress
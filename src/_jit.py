@@ -0,0 +1,14 @@
+"""Optional numba JIT shared by the numeric kernels
+
+Import njit from here; without numba installed it is a no-op decorator
+and the kernels run as plain Python.
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: leave the function as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
@@ -88,14 +88,14 @@ class HabitTrackerApp:
         from datetime import date
         health_snapshot = self.health.get_comprehensive_health_snapshot(date.today())
         
-        if health_snapshot['data_source'] == 'apple_health':
+        if health_snapshot.data_source == 'apple_health':
             print(f"\n📊 Your Apple Health data today:")
         else:
             print(f"\n📊 Your health context today (simulated):")
         
-        print(f"  💤 Sleep Quality: {health_snapshot['sleep_quality']:.1f}/10")
-        print(f"  ⚡ Energy Level: {health_snapshot['energy_level']:.1f}/10")
-        print(f"  😰 Stress Level: {health_snapshot['stress_level']:.1f}/10")
+        print(f"  💤 Sleep Quality: {health_snapshot.sleep_quality:.1f}/10")
+        print(f"  ⚡ Energy Level: {health_snapshot.energy_level:.1f}/10")
+        print(f"  😰 Stress Level: {health_snapshot.stress_level:.1f}/10")
         
         # Check if already logged today
         if self._has_logged_today():
@@ -205,10 +205,10 @@ class HabitTrackerApp:
             'context_notes': completion.context_notes,
             'time_of_day': completion.time_of_day,
             'day_of_week': completion.day_of_week,
-            'sleep_quality': health_snapshot['sleep_quality'],
-            'stress_level': health_snapshot['stress_level'],
-            'energy_level': health_snapshot['energy_level'],
-            'health_data_source': health_snapshot['data_source'],
+            'sleep_quality': health_snapshot.sleep_quality,
+            'stress_level': health_snapshot.stress_level,
+            'energy_level': health_snapshot.energy_level,
+            'health_data_source': health_snapshot.data_source,
         }
         
         df = pd.concat([df, pd.DataFrame([completion_dict])], ignore_index=True)
@@ -222,8 +222,8 @@ class HabitTrackerApp:
             df_sim = pd.DataFrame()
         
         # Update row with actual health data
-        row['sleep_quality'] = health_snapshot['sleep_quality']
-        row['stress_level'] = health_snapshot['stress_level']
+        row['sleep_quality'] = health_snapshot.sleep_quality
+        row['stress_level'] = health_snapshot.stress_level
         row['work_intensity'] = 5  # Could ask user or infer
         
         df_sim = pd.concat([df_sim, pd.DataFrame([row])], ignore_index=True)
@@ -501,10 +501,10 @@ class HabitTrackerApp:
                 snapshot = self.health.get_comprehensive_health_snapshot(day)
                 
                 print(f"  {day.strftime('%a, %b %d')}:")
-                print(f"    💤 Sleep: {snapshot['sleep_quality']:.1f}/10")
-                print(f"    ⚡ Energy: {snapshot['energy_level']:.1f}/10")
-                print(f"    😰 Stress: {snapshot['stress_level']:.1f}/10")
-                print(f"    🔄 Recovery: {snapshot['recovery_score']:.1f}/10")
+                print(f"    💤 Sleep: {snapshot.sleep_quality:.1f}/10")
+                print(f"    ⚡ Energy: {snapshot.energy_level:.1f}/10")
+                print(f"    😰 Stress: {snapshot.stress_level:.1f}/10")
+                print(f"    🔄 Recovery: {snapshot.recovery_score:.1f}/10")
                 print()
     
     @staticmethod
@@ -8,11 +8,335 @@ TODO: Implement actual HealthKit API calls
 - Parse XML export or use HealthKit API directly
 """
 
-from datetime import datetime, date, timedelta
-from typing import Optional, Dict, Any
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
+from datetime import date, timedelta
+from math import inf, isfinite, nextafter
+from typing import Optional, Dict, Any, NamedTuple, Final, Tuple
 from pathlib import Path
-import json
-import re
+import logging
+import os
+
+import numpy as np
+
+from src._jit import njit
+
+try:
+    # Optional C JSON parser; same results as json.loads for our exports
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+try:
+    # Optional streaming parser for exports that have grown large
+    import ijson
+except ImportError:
+    ijson = None
+
+
+log = logging.getLogger(__name__)
+
+# Scoring thresholds shared by the scalar and vectorized scorers
+_SCORE_MIN: Final = 1.0
+_SCORE_MAX: Final = 10.0
+
+_SLEEP_POOR_LO: Final = 5.0       # hours
+_SLEEP_FAIR_LO: Final = 6.0
+_SLEEP_OPTIMAL_LO: Final = 7.0
+_SLEEP_OPTIMAL_HI: Final = 9.0
+_SLEEP_HOURS_THRESH: Final = (_SLEEP_POOR_LO, _SLEEP_FAIR_LO, _SLEEP_OPTIMAL_LO, nextafter(_SLEEP_OPTIMAL_HI, inf))
+_SLEEP_HOURS_SCORES: Final = (3.0, 5.0, 7.0, 9.0, 6.0)  # >9 hours scores 6
+
+_ENERGY_OPTIMAL_LO: Final = 200   # active calories
+_ENERGY_OPTIMAL_HI: Final = 500
+_ENERGY_HEAVY: Final = 800
+
+_HRV_DIVISOR: Final = 10.0         # ms per point (ms -> 1-10)
+_RESTING_HR_BASELINE: Final = 50   # bpm
+_RESTING_HR_DIVISOR: Final = 5.0   # bpm per point
+
+# Sleep quality point tables: score = SCORES[_bin(THRESH, value)].
+# nextafter(x, inf) turns "<= x" upper bounds into bisect_right cut points.
+# Thresholds are all floats so numba sees homogeneous tuples.
+_DURATION_THRESH: Final = (5.0, 6.0, 7.0, nextafter(9.0, inf), nextafter(10.0, inf), nextafter(11.0, inf))  # hours
+_DURATION_SCORES: Final = (10, 15, 20, 25, 20, 15, 10)
+_DEEP_PCT_THRESH: Final = (5.0, 10.0, 15.0, nextafter(25.0, inf), nextafter(30.0, inf))
+_DEEP_PCT_SCORES: Final = (10, 15, 20, 25, 20, 10)
+_REM_PCT_THRESH: Final = (10.0, 15.0, 20.0, nextafter(25.0, inf), nextafter(30.0, inf))
+_REM_PCT_SCORES: Final = (10, 15, 20, 25, 20, 10)
+_AWAKE_THRESH: Final = (5.0, 15.0, 30.0)  # minutes
+_AWAKE_SCORES: Final = (15, 12, 8, 5)
+
+# Sleep TXT line labels: (prefix, output key, value in hours rather than minutes)
+_SLEEP_FIELDS: Final = (
+    ('Total Time Asleep:', 'total_hours', True),
+    ('Deep for', 'deep_minutes', False),
+    ('REM for', 'rem_minutes', False),
+    ('Awake for', 'awake_minutes', False),
+)
+
+# Top-level keys read from the JSON export with their fallback values, and
+# the size above which it is streamed (when ijson is installed) instead of
+# parsed whole
+_JSON_DEFAULTS: Final = {'sleep_hours': 7.0, 'active_energy': 300, 'hrv': 50, 'resting_hr': 60}
+_JSON_KEYS: Final = frozenset(_JSON_DEFAULTS)
+_JSON_STREAM_MIN_BYTES: Final = 64 * 1024
+
+# Snapshots kept per integration (covers a month of dashboard refreshes)
+_SNAPSHOT_CACHE_SIZE: Final = 32
+
+# Month abbreviations as written in the sleep export headers ('%b')
+_MONTHS: Final = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+# Simulated score ranges, columns: sleep, energy, stress, recovery
+_SIM_LOW: Final = np.array([5.0, 5.0, 3.0, 6.0])
+_SIM_HIGH: Final = np.array([9.0, 9.0, 7.0, 9.0])
+
+
+@lru_cache(maxsize=1)
+def _default_icloud_dir() -> Path:
+    """iCloud habit_coach folder, resolved against $HOME once per process"""
+    return Path.home() / "Library/Mobile Documents/com~apple~CloudDocs/habit_coach"
+
+
+@lru_cache(maxsize=4)
+def _read_json_export(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a JSON export; mtime_ns and size are only part of the cache key"""
+    with open(path, 'rb') as f:
+        if ijson is not None and size >= _JSON_STREAM_MIN_BYTES:
+            data = _stream_json_keys(f)
+        else:
+            data = _json_loads(f.read())
+    
+    # Coerce here so a bad value is reported once per file version
+    if isinstance(data, dict):
+        _coerce_scored_values(data, path)
+    return data
+
+
+def _coerce_scored_values(data: Dict[str, Any], path: str) -> None:
+    """Turn the scored keys into finite numbers, in place, before caching"""
+    for key, default in _JSON_DEFAULTS.items():
+        if key not in data:
+            continue
+        value = data[key]
+        if isinstance(value, int) and not isinstance(value, bool):
+            continue
+        
+        # Shortcuts store values as Text ("7.5", "" or null)
+        try:
+            number = float(value) if not isinstance(value, bool) else None
+        except (TypeError, ValueError):
+            number = None
+        if number is None or not isfinite(number):
+            log.warning("Invalid %s %r in %s, using %s", key, value, path, default)
+            number = default
+        data[key] = number
+
+
+def _stream_json_keys(f) -> Dict[str, Any]:
+    """
+    Pull only the top-level values we score from a large export
+    
+    Agrees with json.loads: the document must be an object and a repeated
+    key keeps its last value, so the whole file is still read (but never
+    held in memory).
+    """
+    data = {}
+    try:
+        events = ijson.parse(f, use_float=True)
+        if next(events)[1] != 'start_map':
+            raise ValueError("health export is not a JSON object")
+        for prefix, event, value in events:
+            if prefix not in _JSON_KEYS:
+                continue
+            if event in ('number', 'string', 'boolean', 'null'):
+                data[prefix] = value
+            elif event in ('start_map', 'start_array'):
+                # Kept as a placeholder so coercion reports the bad value
+                data[prefix] = {} if event == 'start_map' else []
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+    return data
+
+
+def _parse_hm(text: str) -> Tuple[int, int]:
+    """Extract (hours, minutes) from e.g. 'Deep for 0 hours and 54 minutes'"""
+    hours = minutes = 0
+    found_hours = found_minutes = False
+    number = ''
+    
+    # Walk whitespace tokens; a unit word takes the number just before it
+    for token in text.split():
+        if number:
+            if not found_hours and token.startswith('hour'):
+                hours, found_hours = int(number), True
+            elif not found_minutes and token.startswith('minute'):
+                minutes, found_minutes = int(number), True
+        
+        if token.isdecimal():
+            number = token
+        else:
+            # 'Asleep:6' -> '6'
+            tail = token.rpartition(':')[2]
+            number = tail if tail.isdecimal() else ''
+    
+    return hours, minutes
+
+
+def _parse_header_date(text: str) -> date:
+    """Parse '9 Oct 2025' without strptime; ValueError if malformed"""
+    parts = text.split()
+    # Abbreviations only, case-insensitive, like strptime's %b ('oct', 'OCT')
+    month = _MONTHS.get(parts[1].title()) if len(parts) == 3 else None
+    if month is None:
+        raise ValueError(f"unrecognised date {text!r}")
+    return date(int(parts[2]), month, int(parts[0]))
+
+
+def _parse_clock_hour(text: str) -> Optional[int]:
+    """Hour of day (0-23) from '10:30 pm' or '22:30'; None if unparseable"""
+    text = text.lower().strip()
+    suffix = text[-2:]
+    if suffix in ('am', 'pm'):
+        text = text[:-2]
+    
+    # Validate up front rather than catching int()'s ValueError
+    hour_text = text.split(':')[0].strip()
+    if not hour_text.isdecimal():
+        return None
+    hour = int(hour_text)
+    
+    if suffix == 'pm':
+        return hour if hour == 12 else hour + 12
+    if suffix == 'am':
+        return 0 if hour == 12 else hour
+    return hour
+
+
+@lru_cache(maxsize=512)
+def _sleep_quality_from_hours(hours: float) -> float:
+    """Convert sleep hours to quality score"""
+    return _SLEEP_HOURS_SCORES[bisect_right(_SLEEP_HOURS_THRESH, hours)]
+
+
+@lru_cache(maxsize=512)
+def _energy_from_activity(active_energy: float) -> float:
+    """Calculate energy level from activity calories"""
+    # More activity yesterday = less energy today (recovery)
+    # 200-500 cal = optimal (8), >800 = tired next day (5), otherwise 7
+    optimal = _ENERGY_OPTIMAL_LO <= active_energy <= _ENERGY_OPTIMAL_HI
+    heavy = active_energy > _ENERGY_HEAVY
+    return 7.0 + optimal - 2.0 * heavy
+
+
+@lru_cache(maxsize=512)
+def _stress_from_hrv(hrv: float, resting_hr: float) -> float:
+    """Calculate stress score from HRV and HR"""
+    # Higher HRV = less stress, Lower resting HR = less stress
+    # Typical HRV: 20-100ms, normalized to 1-10 and inverted for stress
+    # min/max clamps map a NaN reading to a bound (NaN HRV scores 1, a NaN
+    # result scores 10); the Cython build and stress_vec do the same
+    hrv_score = min(_SCORE_MAX, max(_SCORE_MIN, hrv / _HRV_DIVISOR))
+    # Divide rather than multiply by 0.1 / 0.2 to stay bit-identical to /10 and /5
+    stress = _SCORE_MAX - (hrv_score + (_SCORE_MAX - (resting_hr - _RESTING_HR_BASELINE) / _RESTING_HR_DIVISOR)) / 2
+    return max(_SCORE_MIN, min(_SCORE_MAX, stress))
+
+
+@njit(cache=True)
+def _bin(thresh, value) -> int:
+    """bisect_right(thresh, value) for the short sorted tables above"""
+    i = 0
+    while i < len(thresh) and not value < thresh[i]:
+        i += 1
+    return i
+
+
+@njit(cache=True)
+def _score_sleep(duration_hours: float, deep_min: float, rem_min: float, awake_min: float,
+                 bedtime_hour: int, wake_hour: int) -> float:
+    """
+    1-10 sleep quality from numeric sleep fields (see _calculate_sleep_quality)
+    
+    Hours are -1 when unknown, so the kernel compiles under numba. The
+    result is left unrounded: numba's round() differs from Python's on
+    ties such as 6.85.
+    """
+    total_score = 0
+    
+    # 1. Total Sleep Duration (0-25 points)
+    total_score += _DURATION_SCORES[_bin(_DURATION_THRESH, duration_hours)]
+    
+    # 2. Deep Sleep Percentage (0-25 points)
+    total_min = duration_hours * 60
+    deep_pct = (deep_min / total_min * 100) if total_min > 0 else 0.0
+    total_score += _DEEP_PCT_SCORES[_bin(_DEEP_PCT_THRESH, deep_pct)]
+    
+    # 3. REM Sleep Percentage (0-25 points)
+    rem_pct = (rem_min / total_min * 100) if total_min > 0 else 0.0
+    total_score += _REM_PCT_SCORES[_bin(_REM_PCT_THRESH, rem_pct)]
+    
+    # 4. Time Awake (0-15 points)
+    total_score += _AWAKE_SCORES[_bin(_AWAKE_THRESH, awake_min)]
+    
+    # 5. Sleep Timing (0-10 points)
+    timing_score = 0
+    
+    # Bedtime: 9 PM - 11 PM optimal
+    if bedtime_hour >= 0:
+        if 21 <= bedtime_hour <= 23:
+            timing_score += 5
+        elif (20 <= bedtime_hour < 21) or (23 < bedtime_hour <= 24) or bedtime_hour == 0:
+            timing_score += 3  # Within 1 hour
+    
+    # Wake time: 6 AM - 8 AM optimal
+    if wake_hour >= 0:
+        if 6 <= wake_hour <= 8:
+            timing_score += 5
+        elif (5 <= wake_hour < 6) or (8 < wake_hour <= 9):
+            timing_score += 3  # Within 1 hour
+    
+    total_score += timing_score
+    
+    # Convert 0-100 score to 1-10 scale
+    final_score = (total_score / 100) * 9 + 1  # Maps 0→1, 100→10
+    
+    return min(10.0, max(1.0, final_score))
+
+
+# Use the compiled scorers when the optional extension has been built
+# (cythonize -i src/_health_scores.pyx); otherwise keep the memoized
+# Python ones. Inputs are exact values from the exports, not rounded,
+# so cached results are identical to uncached ones.
+try:
+    from src._health_scores import (
+        sleep_quality_from_hours as _sleep_quality_from_hours,
+        energy_from_activity as _energy_from_activity,
+        stress_from_hrv as _stress_from_hrv,
+    )
+except ImportError:
+    pass
+
+
+class HealthSnapshot(NamedTuple):
+    """Daily health features consumed by the ML model"""
+    
+    sleep_quality: float     # 1-10
+    energy_level: float      # 1-10
+    stress_level: float      # 1-10
+    recovery_score: float    # 1-10
+    data_source: str         # 'apple_health' or 'simulated'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for JSON / template serialization"""
+        return self._asdict()
 
 
 class AppleHealthIntegration:
@@ -20,26 +344,79 @@ class AppleHealthIntegration:
     
     def __init__(self, user_id: str):
         self.user_id = user_id
-        self.cache_dir = Path("data/health_cache")
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Check if health data file exists in iCloud
-        self.icloud_dir = Path.home() / "Library/Mobile Documents/com~apple~CloudDocs/habit_coach"
-        self.icloud_path = self.icloud_dir / "health_data.json"
+        # iCloud paths and availability are resolved on first use so that
+        # constructing the integration touches neither $HOME nor the disk
+        self._icloud_dir: Optional[Path] = None
+        self._icloud_path: Optional[Path] = None
+        self._enabled: Optional[bool] = None
         
-        # Check for any health data files (JSON or TXT from shortcut)
-        self.enabled = self.icloud_path.exists() or (self.icloud_dir.exists() and any(self.icloud_dir.glob('*.txt')))
-        
-        if self.enabled:
-            print(f"  ✅ Found Apple Health data at: {self.icloud_dir}")
-        else:
-            print(f"  ℹ️  Apple Health file not found at: {self.icloud_dir}")
+        # Sleep TXT files keyed by date, invalidated by the folder and file mtimes
+        self._date_index: Optional[Dict[date, Path]] = None
+        self._index_mtime_ns = -1
+        self._header_cache: Dict[str, Tuple[int, str]] = {}  # path -> (mtime_ns, first line)
         
+        # Recent snapshots keyed by date and source file mtimes (LRU)
+        self._snapshot_cache: "OrderedDict[Tuple[int, int, int], HealthSnapshot]" = OrderedDict()
+    
+    @property
+    def icloud_dir(self) -> Path:
+        """iCloud Drive folder the iOS Shortcut writes to"""
+        if self._icloud_dir is None:
+            self._icloud_dir = _default_icloud_dir()
+        return self._icloud_dir
+    
+    @property
+    def icloud_path(self) -> Path:
+        """JSON health export inside the iCloud folder"""
+        if self._icloud_path is None:
+            self._icloud_path = self.icloud_dir / "health_data.json"
+        return self._icloud_path
+    
+    @property
+    def enabled(self) -> bool:
+        return self.is_available()
+    
     def is_available(self) -> bool:
         """Check if Apple Health data is available"""
         # TODO: Check if HealthKit is accessible
         # TODO: Check if user has granted permissions
-        return self.enabled
+        if self._enabled is None:
+            # Check for any health data files (JSON or TXT from shortcut)
+            self._enabled = self.icloud_path.exists() or self._has_any_txt()
+            
+            if self._enabled:
+                log.info("Found Apple Health data at: %s", self.icloud_dir)
+            else:
+                log.info("Apple Health file not found at: %s", self.icloud_dir)
+        
+        return self._enabled
+    
+    def refresh(self) -> None:
+        """Forget cached availability and the sleep file index
+        
+        Files added or removed, and in-place rewrites of a file found for
+        the date being looked up, are noticed automatically. Call this
+        after the iCloud folder is created or emptied, or after a file is
+        rewritten in place to cover a new date.
+        """
+        self._enabled = None
+        self._date_index = None
+        self._index_mtime_ns = -1
+        self._header_cache = {}
+        self._snapshot_cache.clear()
+    
+    def _has_any_txt(self) -> bool:
+        """True as soon as one .txt file is seen in the iCloud folder"""
+        try:
+            with os.scandir(self.icloud_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.txt') and entry.is_file():
+                        return True
+        except OSError:
+            # Missing, not a directory or not readable: no data, as with glob()
+            pass
+        return False
     
     def get_sleep_data(self, target_date: date) -> Optional[Dict[str, Any]]:
         """
@@ -53,80 +430,174 @@ class AppleHealthIntegration:
                 'rem_sleep_minutes': int,
                 'awake_minutes': int,
                 'bedtime': str,           # HH:MM
-                'wake_time': str          # HH:MM
+                'wake_time': str,         # HH:MM
+                'bedtime_hour': int,      # 0-23, None if unparseable
+                'wake_hour': int          # 0-23, None if unparseable
             }
         """
         if not self.is_available():
             return None
         
+        return self._sleep_from(target_date)
+    
+    def _sleep_from(self, target_date: date,
+                    health_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """get_sleep_data body; health_data is the JSON export if already loaded"""
         try:
             # Find the text file that matches the target date
-            txt_files = list(self.icloud_dir.glob('*.txt'))
+            txt_file = self._find_sleep_file(target_date)
+            if txt_file is not None:
+                parsed_data = self._parse_sleep_text_file(txt_file)
+                if parsed_data:
+                    sleep_hours = parsed_data.get('total_hours', 7.0)
+                    sleep_dict = {
+                        'duration_hours': sleep_hours,
+                        'deep_sleep_minutes': parsed_data.get('deep_minutes', 0),
+                        'rem_sleep_minutes': parsed_data.get('rem_minutes', 0),
+                        'awake_minutes': parsed_data.get('awake_minutes', 0),
+                        'bedtime': parsed_data.get('bedtime_str', '23:00'),
+                        'wake_time': parsed_data.get('waketime_str', '07:00'),
+                        'bedtime_hour': parsed_data.get('bedtime_hour', 23),
+                        'wake_hour': parsed_data.get('wake_hour', 7)
+                    }
+                    # Calculate comprehensive quality score
+                    sleep_dict['quality_score'] = self._calculate_sleep_quality(sleep_dict)
+                    return sleep_dict
             
-            for txt_file in txt_files:
-                # Read first line to check date
-                with open(txt_file, 'r') as f:
-                    first_line = f.readline().strip()
-                
-                # Parse date from format: "9 Oct 2025 at 1:49 am-9 Oct 2025 at 8:56 am"
-                if ' at ' in first_line and '-' in first_line:
-                    # Extract the date part (wake up date is what matters)
-                    wake_part = first_line.split('-')[1].strip()
-                    date_str = wake_part.split(' at ')[0].strip()
-                    
-                    # Parse date (format: "9 Oct 2025")
-                    try:
-                        from datetime import datetime
-                        file_date = datetime.strptime(date_str, '%d %b %Y').date()
-                        
-                        # Match with target date
-                        if file_date == target_date:
-                            parsed_data = self._parse_sleep_text_file(txt_file)
-                            if parsed_data:
-                                sleep_hours = parsed_data.get('total_hours', 7.0)
-                                sleep_dict = {
-                                    'duration_hours': sleep_hours,
-                                    'deep_sleep_minutes': parsed_data.get('deep_minutes', 0),
-                                    'rem_sleep_minutes': parsed_data.get('rem_minutes', 0),
-                                    'awake_minutes': parsed_data.get('awake_minutes', 0),
-                                    'bedtime': parsed_data.get('bedtime_str', '23:00'),
-                                    'wake_time': parsed_data.get('waketime_str', '07:00')
-                                }
-                                # Calculate comprehensive quality score
-                                sleep_dict['quality_score'] = self._calculate_sleep_quality(sleep_dict)
-                                return sleep_dict
-                    except Exception as e:
-                        print(f"  ⚠️  Error parsing date from {txt_file.name}: {e}")
-                        continue
+        except (OSError, ValueError) as e:
+            log.warning("Error reading sleep files: %s", e)
+        
+        # Fall back to JSON format
+        if health_data is None:
+            health_data = self._load_health_data()
+        if health_data is None:
+            return None
+        
+        # Parse the data from iOS Shortcuts
+        sleep_hours = health_data.get('sleep_hours', 7.0)
+        
+        return {
+            'duration_hours': sleep_hours,
+            'quality_score': self._calculate_sleep_quality_from_hours(sleep_hours),
+            'deep_sleep_minutes': 0,
+            'rem_sleep_minutes': 0,
+            'awake_minutes': 0,
+            'bedtime': '23:00',
+            'wake_time': '07:00',
+            'bedtime_hour': 23,
+            'wake_hour': 7
+        }
+    
+    def _find_sleep_file(self, target_date: date) -> Optional[Path]:
+        """
+        Sleep TXT file for a date, rescanning if that file was rewritten
+        
+        Rewriting a file in place leaves the folder's mtime alone, so a
+        cached hit is checked against the file's own mtime. Misses rely
+        on the folder mtime (and refresh()) so they cost no extra I/O.
+        """
+        previous = self._date_index
+        txt_file = self._get_date_index().get(target_date)
+        if txt_file is None or self._date_index is not previous:
+            # A miss, or a freshly built index
+            return txt_file
+        
+        cached = self._header_cache.get(str(txt_file))
+        try:
+            if cached is not None and cached[0] == os.stat(txt_file).st_mtime_ns:
+                return txt_file
+        except FileNotFoundError:
+            pass
+        
+        return self._get_date_index(rescan=True).get(target_date)
+    
+    def _get_date_index(self, rescan: bool = False) -> Dict[date, Path]:
+        """
+        Map wake-up date -> sleep TXT file
+        
+        Built once by reading each file's header line, then reused until
+        the iCloud folder's mtime changes (a file added or removed) or a
+        rescan is requested. On rebuild, headers of files whose mtime is
+        unchanged are reused.
+        """
+        try:
+            # Integer nanoseconds, so back-to-back writes are not missed
+            dir_mtime = os.stat(self.icloud_dir).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        
+        if not rescan and self._date_index is not None and dir_mtime == self._index_mtime_ns:
+            return self._date_index
+        
+        index = {}
+        headers = {}
+        with os.scandir(self.icloud_dir) as entries:
+            txt_entries = [e for e in entries if e.name.endswith('.txt') and e.is_file()]
+        
+        for entry in txt_entries:
+            # Read first line to check date, unless the file is unchanged
+            try:
+                file_mtime = entry.stat().st_mtime_ns
+                cached = self._header_cache.get(entry.path)
+                if cached is not None and cached[0] == file_mtime:
+                    first_line = cached[1]
+                else:
+                    with open(entry.path, 'r') as f:
+                        first_line = f.readline().strip()
+            except (OSError, ValueError) as e:
+                # One unreadable file shouldn't hide the rest
+                log.warning("Error reading %s: %s", entry.name, e)
+                continue
+            headers[entry.path] = (file_mtime, first_line)
             
-            # Fall back to JSON format
-            if self.icloud_path.exists():
-                with open(self.icloud_path, 'r') as f:
-                    health_data = json.load(f)
-                
-                # Parse the data from iOS Shortcuts
-                sleep_hours = health_data.get('sleep_hours', 7.0)
+            # Parse date from format: "9 Oct 2025 at 1:49 am-9 Oct 2025 at 8:56 am"
+            if ' at ' in first_line and '-' in first_line:
+                # Extract the date part (wake up date is what matters)
+                wake_part = first_line.split('-')[1].strip()
+                date_str = wake_part.split(' at ')[0].strip()
                 
-                return {
-                    'duration_hours': sleep_hours,
-                    'quality_score': self._calculate_sleep_quality_from_hours(sleep_hours),
-                    'deep_sleep_minutes': 0,
-                    'rem_sleep_minutes': 0,
-                    'awake_minutes': 0,
-                    'bedtime': '23:00',
-                    'wake_time': '07:00'
-                }
+                # Parse date (format: "9 Oct 2025")
+                try:
+                    file_date = _parse_header_date(date_str)
+                except ValueError as e:
+                    log.warning("Error parsing date from %s: %s", entry.name, e)
+                    continue
                 
-        except Exception as e:
-            print(f"  ⚠️  Error reading health data: {e}")
+                if file_date not in index:
+                    index[file_date] = Path(entry.path)
+        
+        self._date_index = index
+        self._index_mtime_ns = dir_mtime
+        self._header_cache = headers
+        return index
+    
+    def _load_health_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the iCloud JSON export; None if missing or unreadable
+        
+        Parses are cached per (path, mtime) across instances, so the
+        getters and per-request integrations share one parse per file
+        version. Scored values arrive already coerced to numbers.
+        """
+        try:
+            st = os.stat(self.icloud_path)
+            health_data = _read_json_export(str(self.icloud_path), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            # TXT-only setups never write the JSON file
+            return None
+        except (OSError, ValueError) as e:
+            log.warning("Error reading health data: %s", e)
+            return None
+        
+        if not isinstance(health_data, dict):
+            log.warning("Unexpected health data format in %s", self.icloud_path)
             return None
+        
+        return health_data
     
     def _parse_sleep_text_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Parse Apple Health sleep data from text file created by iOS Shortcut"""
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
             # Parse format like:
             # 9 Oct 2025 at 1:49 am-9 Oct 2025 at 8:56 am
             # Total Time Asleep:6 hours 39 minutes
@@ -136,53 +607,22 @@ class AppleHealthIntegration:
             
             data = {}
             
-            # Extract total sleep
-            if 'Total Time Asleep:' in content:
-                sleep_line = [l for l in content.split('\n') if 'Total Time Asleep:' in l][0]
-                # Extract hours and minutes
-                import re
-                hours_match = re.search(r'(\d+)\s+hours?', sleep_line)
-                minutes_match = re.search(r'(\d+)\s+minutes?', sleep_line)
-                
-                hours = int(hours_match.group(1)) if hours_match else 0
-                minutes = int(minutes_match.group(1)) if minutes_match else 0
-                data['total_hours'] = hours + (minutes / 60.0)
-            
-            # Extract deep sleep
-            if 'Deep for' in content:
-                deep_line = [l for l in content.split('\n') if 'Deep for' in l][0]
-                import re
-                hours_match = re.search(r'(\d+)\s+hours?', deep_line)
-                minutes_match = re.search(r'(\d+)\s+minutes?', deep_line)
-                
-                hours = int(hours_match.group(1)) if hours_match else 0
-                minutes = int(minutes_match.group(1)) if minutes_match else 0
-                data['deep_minutes'] = (hours * 60) + minutes
-            
-            # Extract REM sleep
-            if 'REM for' in content:
-                rem_line = [l for l in content.split('\n') if 'REM for' in l][0]
-                import re
-                hours_match = re.search(r'(\d+)\s+hours?', rem_line)
-                minutes_match = re.search(r'(\d+)\s+minutes?', rem_line)
-                
-                hours = int(hours_match.group(1)) if hours_match else 0
-                minutes = int(minutes_match.group(1)) if minutes_match else 0
-                data['rem_minutes'] = (hours * 60) + minutes
-            
-            # Extract awake time
-            if 'Awake for' in content:
-                awake_line = [l for l in content.split('\n') if 'Awake for' in l][0]
-                import re
-                hours_match = re.search(r'(\d+)\s+hours?', awake_line)
-                minutes_match = re.search(r'(\d+)\s+minutes?', awake_line)
-                
-                hours = int(hours_match.group(1)) if hours_match else 0
-                minutes = int(minutes_match.group(1)) if minutes_match else 0
-                data['awake_minutes'] = (hours * 60) + minutes
+            # Stream the file, matching each label anywhere in the line
+            # (Shortcuts may prefix bullets or words), and stop as soon as
+            # every field has been seen
+            with open(file_path, 'r') as f:
+                first_line = f.readline().rstrip('\n')
+                for line in chain((first_line,), f):
+                    line = line.strip()
+                    for label, key, as_hours in _SLEEP_FIELDS:
+                        if key not in data and label in line:  # First occurrence wins
+                            hours, minutes = _parse_hm(line)
+                            data[key] = hours + (minutes / 60.0) if as_hours else (hours * 60) + minutes
+                    
+                    if len(data) == len(_SLEEP_FIELDS):
+                        break
             
             # Extract times from first line
-            first_line = content.split('\n')[0]
             if ' at ' in first_line and '-' in first_line:
                 times = first_line.split('-')
                 if len(times) == 2:
@@ -192,25 +632,18 @@ class AppleHealthIntegration:
                     waketime_str = times[1].split(' at ')[-1].strip()
                     data['bedtime_str'] = bedtime_str
                     data['waketime_str'] = waketime_str
+                    data['bedtime_hour'] = _parse_clock_hour(bedtime_str)
+                    data['wake_hour'] = _parse_clock_hour(waketime_str)
             
             return data
             
         except Exception as e:
-            print(f"  ⚠️  Error parsing text file: {e}")
+            log.warning("Error parsing text file: %s", e)
             return None
     
     def _calculate_sleep_quality_from_hours(self, hours: float) -> float:
         """Convert sleep hours to quality score"""
-        if 7 <= hours <= 9:
-            return 9.0
-        elif 6 <= hours < 7:
-            return 7.0
-        elif 5 <= hours < 6:
-            return 5.0
-        elif hours < 5:
-            return 3.0
-        else:  # >9 hours
-            return 6.0
+        return _sleep_quality_from_hours(hours)
     
     def get_activity_data(self, target_date: date) -> Optional[Dict[str, Any]]:
         """
@@ -228,36 +661,30 @@ class AppleHealthIntegration:
         if not self.is_available():
             return None
         
-        try:
-            with open(self.icloud_path, 'r') as f:
-                health_data = json.load(f)
-            
-            active_energy = health_data.get('active_energy', 300)
-            
-            # Calculate energy level from activity
-            energy_level = self._calculate_energy_from_activity(active_energy)
-            
-            return {
-                'active_energy': active_energy,
-                'steps': 0,  # Could add to shortcut
-                'exercise_minutes': 0,
-                'stand_hours': 0,
-                'energy_level': energy_level
-            }
-        except Exception as e:
-            # Silently fail - using biometric CSV data instead
+        return self._activity_from(self._load_health_data())
+    
+    def _activity_from(self, health_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """get_activity_data body, given the loaded JSON export"""
+        if health_data is None:
+            # Using biometric CSV data instead
             return None
+        
+        active_energy = health_data.get('active_energy', 300)
+        
+        # Calculate energy level from activity
+        energy_level = self._calculate_energy_from_activity(active_energy)
+        
+        return {
+            'active_energy': active_energy,
+            'steps': 0,  # Could add to shortcut
+            'exercise_minutes': 0,
+            'stand_hours': 0,
+            'energy_level': energy_level
+        }
     
     def _calculate_energy_from_activity(self, active_energy: int) -> float:
         """Calculate energy level from activity calories"""
-        # More activity yesterday = less energy today (recovery)
-        # 200-500 cal = optimal, >800 = tired next day
-        if 200 <= active_energy <= 500:
-            return 8.0
-        elif active_energy > 800:
-            return 5.0  # Tired from hard workout
-        else:
-            return 7.0
+        return _energy_from_activity(active_energy)
     
     def get_hrv_data(self, target_date: date) -> Optional[Dict[str, Any]]:
         """
@@ -273,37 +700,58 @@ class AppleHealthIntegration:
         if not self.is_available():
             return None
         
-        try:
-            with open(self.icloud_path, 'r') as f:
-                health_data = json.load(f)
-            
-            hrv = health_data.get('hrv', 50)
-            resting_hr = health_data.get('resting_hr', 60)
-            
-            # Calculate stress from HRV (lower HRV = higher stress)
-            stress = self._calculate_stress_from_hrv(hrv, resting_hr)
-            
-            return {
-                'avg_hrv': hrv,
-                'stress_score': stress,
-                'resting_hr': resting_hr
-            }
-        except Exception as e:
-            # Silently fail - using biometric CSV data instead
+        return self._hrv_from(self._load_health_data())
+    
+    def _hrv_from(self, health_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """get_hrv_data body, given the loaded JSON export"""
+        if health_data is None:
+            # Using biometric CSV data instead
             return None
+        
+        hrv = health_data.get('hrv', 50)
+        resting_hr = health_data.get('resting_hr', 60)
+        
+        # Calculate stress from HRV (lower HRV = higher stress)
+        stress = self._calculate_stress_from_hrv(hrv, resting_hr)
+        
+        return {
+            'avg_hrv': hrv,
+            'stress_score': stress,
+            'resting_hr': resting_hr
+        }
     
     def _calculate_stress_from_hrv(self, hrv: float, resting_hr: int) -> float:
         """Calculate stress score from HRV and HR"""
-        # Higher HRV = less stress, Lower resting HR = less stress
-        # Typical HRV: 20-100ms
-        hrv_score = min(10, max(1, hrv / 10))  # Normalize to 1-10
-        hr_score = 10 - (resting_hr - 50) / 5  # Lower HR = better
-        
-        # Invert HRV score for stress (high HRV = low stress)
-        stress = 10 - (hrv_score + hr_score) / 2
-        return max(1, min(10, stress))
+        return _stress_from_hrv(hrv, resting_hr)
+    
+    # Vectorized scorers for batch feature extraction (training backfills)
+    
+    @staticmethod
+    def sleep_quality_vec(hours: np.ndarray) -> np.ndarray:
+        """Array version of _calculate_sleep_quality_from_hours"""
+        hours = np.asarray(hours, dtype=np.float64)
+        bins = np.searchsorted(_SLEEP_HOURS_THRESH, hours, side='right')
+        return np.asarray(_SLEEP_HOURS_SCORES)[bins]
     
-    def get_comprehensive_health_snapshot(self, target_date: date) -> Dict[str, Any]:
+    @staticmethod
+    def energy_vec(active_energy: np.ndarray) -> np.ndarray:
+        """Array version of _calculate_energy_from_activity"""
+        active_energy = np.asarray(active_energy, dtype=np.float64)
+        optimal = (active_energy >= _ENERGY_OPTIMAL_LO) & (active_energy <= _ENERGY_OPTIMAL_HI)
+        heavy = active_energy > _ENERGY_HEAVY
+        return 7.0 + optimal - 2.0 * heavy
+    
+    @staticmethod
+    def stress_vec(hrv: np.ndarray, resting_hr: np.ndarray) -> np.ndarray:
+        """Array version of _calculate_stress_from_hrv"""
+        hrv = np.asarray(hrv, dtype=np.float64)
+        resting_hr = np.asarray(resting_hr, dtype=np.float64)
+        # fmin/fmax skip NaN the way the scalar min/max clamps do
+        stress = _SCORE_MAX - (np.fmin(_SCORE_MAX, np.fmax(_SCORE_MIN, hrv / _HRV_DIVISOR))
+                               + (_SCORE_MAX - (resting_hr - _RESTING_HR_BASELINE) / _RESTING_HR_DIVISOR)) / 2
+        return np.fmax(_SCORE_MIN, np.fmin(_SCORE_MAX, stress))
+    
+    def get_comprehensive_health_snapshot(self, target_date: date) -> HealthSnapshot:
         """
         Get all health data for a specific date
         
@@ -311,30 +759,67 @@ class AppleHealthIntegration:
         suitable for the ML model.
         
         Returns:
-            {
-                'sleep_quality': float,     # 1-10
-                'energy_level': float,      # 1-10
-                'stress_level': float,      # 1-10
-                'recovery_score': float,    # 1-10
-                'data_source': str          # 'apple_health' or 'simulated'
-            }
+            HealthSnapshot(sleep_quality, energy_level, stress_level,
+                           recovery_score, data_source)
         """
         if not self.is_available():
             return self._get_simulated_data(target_date)
         
+        # Reuse the snapshot while the date's source files are unchanged
+        key = self._snapshot_key(target_date)
+        if key is not None and key in self._snapshot_cache:
+            self._snapshot_cache.move_to_end(key)
+            return self._snapshot_cache[key]
+        
         # Get all data
-        sleep = self.get_sleep_data(target_date)
-        activity = self.get_activity_data(target_date)
-        hrv = self.get_hrv_data(target_date)
+        sleep, activity, hrv = self._snapshot_raw(target_date)
         
         # Combine into ML features
-        return {
-            'sleep_quality': self._calculate_sleep_quality(sleep),
-            'energy_level': self._calculate_energy_level(activity),
-            'stress_level': self._calculate_stress_level(hrv),
-            'recovery_score': self._calculate_recovery_score(sleep, hrv),
-            'data_source': 'apple_health'
-        }
+        snapshot = HealthSnapshot(
+            sleep_quality=self._calculate_sleep_quality(sleep),
+            energy_level=self._calculate_energy_level(activity),
+            stress_level=self._calculate_stress_level(hrv),
+            recovery_score=self._calculate_recovery_score(sleep, hrv),
+            data_source='apple_health'
+        )
+        
+        if key is not None:
+            self._snapshot_cache[key] = snapshot
+            if len(self._snapshot_cache) > _SNAPSHOT_CACHE_SIZE:
+                self._snapshot_cache.popitem(last=False)
+        return snapshot
+    
+    def _snapshot_key(self, target_date: date) -> Optional[Tuple[int, int, int]]:
+        """(date ordinal, TXT mtime_ns, JSON mtime_ns); None if the sources can't be stat'ed"""
+        try:
+            txt_file = self._find_sleep_file(target_date)
+            txt_mtime = os.stat(txt_file).st_mtime_ns if txt_file is not None else 0
+        except (OSError, ValueError):
+            # Same errors _sleep_from tolerates; just don't cache this one
+            return None
+        
+        try:
+            json_mtime = os.stat(self.icloud_path).st_mtime_ns
+        except FileNotFoundError:
+            json_mtime = 0
+        except OSError:
+            return None
+        
+        return (target_date.toordinal(), txt_mtime, json_mtime)
+    
+    def _snapshot_raw(self, target_date: date) -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]:
+        """
+        Sleep, activity and HRV dicts for a date from a single read
+        
+        The sleep TXT file is resolved through the date index and the
+        JSON export is loaded once and shared by all three sources.
+        """
+        health_data = self._load_health_data()
+        return (
+            self._sleep_from(target_date, health_data),
+            self._activity_from(health_data),
+            self._hrv_from(health_data)
+        )
     
     def _calculate_sleep_quality(self, sleep_data: Optional[Dict]) -> float:
         """
@@ -352,134 +837,16 @@ class AppleHealthIntegration:
         if not sleep_data:
             return 7.0  # Default
         
-        total_score = 0
-        
-        # 1. Total Sleep Duration (0-25 points)
-        duration_hours = sleep_data.get('duration_hours', 7)
-        if 7 <= duration_hours <= 9:
-            total_score += 25
-        elif (6 <= duration_hours < 7) or (9 < duration_hours <= 10):
-            total_score += 20
-        elif (5 <= duration_hours < 6) or (10 < duration_hours <= 11):
-            total_score += 15
-        else:
-            total_score += 10
-        
-        # 2. Deep Sleep Percentage (0-25 points)
-        deep_min = sleep_data.get('deep_sleep_minutes', 0)
-        total_min = duration_hours * 60
-        deep_pct = (deep_min / total_min * 100) if total_min > 0 else 0
-        
-        if 15 <= deep_pct <= 25:
-            total_score += 25
-        elif (10 <= deep_pct < 15) or (25 < deep_pct <= 30):
-            total_score += 20
-        elif 5 <= deep_pct < 10:
-            total_score += 15
-        else:
-            total_score += 10
-        
-        # 3. REM Sleep Percentage (0-25 points)
-        rem_min = sleep_data.get('rem_sleep_minutes', 0)
-        rem_pct = (rem_min / total_min * 100) if total_min > 0 else 0
-        
-        if 20 <= rem_pct <= 25:
-            total_score += 25
-        elif (15 <= rem_pct < 20) or (25 < rem_pct <= 30):
-            total_score += 20
-        elif 10 <= rem_pct < 15:
-            total_score += 15
-        else:
-            total_score += 10
-        
-        # 4. Time Awake (0-15 points)
-        awake_min = sleep_data.get('awake_minutes', 0)
-        if awake_min < 5:
-            total_score += 15
-        elif 5 <= awake_min < 15:
-            total_score += 12
-        elif 15 <= awake_min < 30:
-            total_score += 8
-        else:
-            total_score += 5
-        
-        # 5. Sleep Timing (0-10 points)
-        bedtime_str = sleep_data.get('bedtime', '')
-        wake_time_str = sleep_data.get('wake_time', '')
-        
-        timing_score = 0
-        
-        # Parse bedtime (looking for 9 PM - 11 PM optimal)
-        if bedtime_str:
-            try:
-                # Handle formats like "10:30 pm" or "22:30"
-                bedtime_str_lower = bedtime_str.lower().strip()
-                if 'pm' in bedtime_str_lower or 'am' in bedtime_str_lower:
-                    # 12-hour format
-                    time_part = bedtime_str_lower.replace('pm', '').replace('am', '').strip()
-                    hour = int(time_part.split(':')[0])
-                    is_pm = 'pm' in bedtime_str_lower
-                    
-                    if is_pm:
-                        if hour == 12:
-                            bedtime_hour = 12
-                        else:
-                            bedtime_hour = hour + 12
-                    else:
-                        if hour == 12:
-                            bedtime_hour = 0
-                        else:
-                            bedtime_hour = hour
-                else:
-                    # 24-hour format
-                    bedtime_hour = int(bedtime_str.split(':')[0])
-                
-                # Optimal: 21:00 (9 PM) - 23:00 (11 PM)
-                if 21 <= bedtime_hour <= 23:
-                    timing_score += 5
-                elif (20 <= bedtime_hour < 21) or (23 < bedtime_hour <= 24) or bedtime_hour == 0:
-                    timing_score += 3  # Within 1 hour
-            except:
-                pass
-        
-        # Parse wake time (looking for 6 AM - 8 AM optimal)
-        if wake_time_str:
-            try:
-                wake_time_str_lower = wake_time_str.lower().strip()
-                if 'pm' in wake_time_str_lower or 'am' in wake_time_str_lower:
-                    # 12-hour format
-                    time_part = wake_time_str_lower.replace('pm', '').replace('am', '').strip()
-                    hour = int(time_part.split(':')[0])
-                    is_pm = 'pm' in wake_time_str_lower
-                    
-                    if is_pm:
-                        if hour == 12:
-                            wake_hour = 12
-                        else:
-                            wake_hour = hour + 12
-                    else:
-                        if hour == 12:
-                            wake_hour = 0
-                        else:
-                            wake_hour = hour
-                else:
-                    # 24-hour format
-                    wake_hour = int(wake_time_str.split(':')[0])
-                
-                # Optimal: 6:00 - 8:00 AM
-                if 6 <= wake_hour <= 8:
-                    timing_score += 5
-                elif (5 <= wake_hour < 6) or (8 < wake_hour <= 9):
-                    timing_score += 3  # Within 1 hour
-            except:
-                pass
-        
-        total_score += timing_score
-        
-        # Convert 0-100 score to 1-10 scale
-        final_score = (total_score / 100) * 9 + 1  # Maps 0→1, 100→10
-        
-        return round(min(10.0, max(1.0, final_score)), 1)
+        bedtime_hour = sleep_data.get('bedtime_hour')
+        wake_hour = sleep_data.get('wake_hour')
+        return round(_score_sleep(
+            float(sleep_data.get('duration_hours', 7)),
+            float(sleep_data.get('deep_sleep_minutes', 0)),
+            float(sleep_data.get('rem_sleep_minutes', 0)),
+            float(sleep_data.get('awake_minutes', 0)),
+            -1 if bedtime_hour is None else bedtime_hour,
+            -1 if wake_hour is None else wake_hour
+        ), 1)
     
     def _calculate_energy_level(self, activity_data: Optional[Dict]) -> float:
         """Convert activity data to 1-10 energy score"""
@@ -514,27 +881,68 @@ class AppleHealthIntegration:
         
         return 7.0
     
-    def _get_simulated_data(self, target_date: date) -> Dict[str, Any]:
+    def _get_simulated_data(self, target_date: date) -> HealthSnapshot:
         """Return simulated data when HealthKit not available"""
-        import random
-        random.seed(target_date.toordinal())  # Consistent per date
+        row = self.simulated_batch(np.array([target_date.toordinal()]))[0]
+        return HealthSnapshot(*row.tolist(), data_source='simulated')
+    
+    @staticmethod
+    def simulated_batch(ordinals: np.ndarray) -> np.ndarray:
+        """
+        Simulated health scores for many dates in one call
         
-        return {
-            'sleep_quality': random.uniform(5, 9),
-            'energy_level': random.uniform(5, 9),
-            'stress_level': random.uniform(3, 7),
-            'recovery_score': random.uniform(6, 9),
-            'data_source': 'simulated'
-        }
+        Each row depends only on its date ordinal (consistent per date,
+        whatever else is in the batch), so ML backfills can generate
+        thousands of days without a Python loop.
+        
+        Returns:
+            float array of shape (N, 4), columns:
+            sleep_quality, energy_level, stress_level, recovery_score
+        """
+        ordinals = np.asarray(ordinals, dtype=np.uint64).reshape(-1, 1)
+        
+        # SplitMix64 hash of a (date, column) counter -> uniform [0, 1)
+        z = (ordinals * np.uint64(4) + np.arange(1, 5, dtype=np.uint64)) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        uniform = (z >> np.uint64(11)) * (1.0 / (1 << 53))
+        
+        return _SIM_LOW + uniform * (_SIM_HIGH - _SIM_LOW)
+    
+    def _get_simulated_range(self, start_date: date, end_date: date) -> np.ndarray:
+        """Simulated scores for every date in [start_date, end_date], shape (N, 4)"""
+        ordinals = np.arange(start_date.toordinal(), end_date.toordinal() + 1)
+        return self.simulated_batch(ordinals)
     
     def export_health_data_to_csv(self, start_date: date, end_date: date, 
-                                  output_file: Path):
+                                  output_file: Path) -> Path:
         """
         Export health data for date range to CSV
         Useful for debugging and manual inspection
         """
-        # TODO: Implement export
-        pass
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        num_days = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=i) for i in range(num_days)]
+        
+        if self.is_available():
+            rows = [self.get_comprehensive_health_snapshot(day) for day in dates]
+        else:
+            # One vectorized draw for the whole range
+            scores = self._get_simulated_range(start_date, end_date).tolist()
+            rows = [HealthSnapshot(*row, data_source='simulated') for row in scores]
+        
+        import csv  # only needed for exports
+        
+        with open(output_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('date',) + HealthSnapshot._fields)
+            for day, snapshot in zip(dates, rows):
+                writer.writerow((day.isoformat(),) + tuple(snapshot))
+        
+        return output_file
     
     def setup_permissions(self):
         """
@@ -603,9 +1011,9 @@ if __name__ == "__main__":
     snapshot = health.get_comprehensive_health_snapshot(today)
     
     print(f"\nHealth data for {today}:")
-    print(f"  Sleep Quality: {snapshot['sleep_quality']:.1f}/10")
-    print(f"  Energy Level: {snapshot['energy_level']:.1f}/10")
-    print(f"  Stress Level: {snapshot['stress_level']:.1f}/10")
-    print(f"  Recovery Score: {snapshot['recovery_score']:.1f}/10")
-    print(f"  Data Source: {snapshot['data_source']}")
+    print(f"  Sleep Quality: {snapshot.sleep_quality:.1f}/10")
+    print(f"  Energy Level: {snapshot.energy_level:.1f}/10")
+    print(f"  Stress Level: {snapshot.stress_level:.1f}/10")
+    print(f"  Recovery Score: {snapshot.recovery_score:.1f}/10")
+    print(f"  Data Source: {snapshot.data_source}")
 
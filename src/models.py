@@ -1,8 +1,21 @@
 """Data models for the habit coach system"""
 
+from dataclasses import dataclass
 from datetime import datetime, time
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
+import numpy as np
+
+
+# Day names as stored in SimulatedDay.day_of_week; index = datetime.weekday()
+DAYS_OF_WEEK = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+_DOW_INDEX = {name: i for i, name in enumerate(DAYS_OF_WEEK)}
+
+
+def _hhmm_to_minutes(time_str: str) -> int:
+    """'18:30' -> 1110"""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
 
 
 class UserProfile(BaseModel):
@@ -54,13 +67,19 @@ class UserProfile(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
 
 
-class HabitCompletion(BaseModel):
-    """Record of a single habit completion or skip"""
+@dataclass(slots=True, kw_only=True)
+class HabitCompletion:
+    """
+    Record of a single habit completion or skip
+    
+    A plain slotted dataclass rather than a BaseModel: one is built per
+    logged attempt and only the rating ranges need checking.
+    """
     
     timestamp: datetime
     completed: bool
-    difficulty_rating: Optional[int] = Field(default=None, ge=1, le=10)
-    motivation_rating: Optional[int] = Field(default=None, ge=1, le=10)
+    difficulty_rating: Optional[int] = None  # 1-10
+    motivation_rating: Optional[int] = None  # 1-10
     duration_minutes: Optional[int] = None
     context_notes: Optional[str] = None
     
@@ -73,6 +92,12 @@ class HabitCompletion(BaseModel):
     reminder_sent: bool = False
     reminder_type: Optional[str] = None
     message_shown: Optional[str] = None
+    
+    def __post_init__(self):
+        for name in ('difficulty_rating', 'motivation_rating'):
+            value = getattr(self, name)
+            if value is not None and not 1 <= value <= 10:
+                raise ValueError(f"{name} must be between 1 and 10, got {value}")
 
 
 class SimulatedDay(BaseModel):
@@ -95,3 +120,38 @@ class SimulatedDay(BaseModel):
     days_since_last: int
     current_streak: int
     total_completions: int
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'SimulatedDay':
+        """Build one day from a simulator DataFrame row (e.g. df.iloc[i])"""
+        return cls(**{key: value.item() if isinstance(value, np.generic) else value
+                      for key, value in row.items()})
+    
+    @staticmethod
+    def to_arrays(days: List['SimulatedDay']) -> Dict[str, np.ndarray]:
+        """
+        Columnar (SoA) view of a list of simulated days for training code
+        
+        day_of_week becomes its index in DAYS_OF_WEEK (0 = monday) and
+        time_attempted becomes minutes after midnight.
+        """
+        n = len(days)
+        
+        def column(values, dtype) -> np.ndarray:
+            return np.fromiter(values, dtype=dtype, count=n)
+        
+        return {
+            'day_number': column((d.day_number for d in days), np.int32),
+            'day_of_week': column((_DOW_INDEX[d.day_of_week] for d in days), np.int8),
+            'time_attempted': column((_hhmm_to_minutes(d.time_attempted) for d in days), np.int16),
+            'completed': column((d.completed for d in days), np.bool_),
+            'difficulty': column((d.difficulty for d in days), np.float32),
+            'motivation': column((d.motivation for d in days), np.float32),
+            'sleep_quality': column((d.sleep_quality for d in days), np.float32),
+            'stress_level': column((d.stress_level for d in days), np.float32),
+            'social_obligations': column((d.social_obligations for d in days), np.bool_),
+            'work_intensity': column((d.work_intensity for d in days), np.float32),
+            'days_since_last': column((d.days_since_last for d in days), np.int32),
+            'current_streak': column((d.current_streak for d in days), np.int32),
+            'total_completions': column((d.total_completions for d in days), np.int32),
+        }
@@ -1,11 +1,23 @@
 """Interactive profiling system to understand user behavior"""
 
 import json
+import re
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
 from src.models import UserProfile
 
+try:
+    # Optional C JSON codec; serializes datetimes itself
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Answer formats, checked before int() so bad input never raises
+_INT_RE = re.compile(r'-?\d+')
+_MULTI_RE = re.compile(r'\d+(?:\s*,\s*\d+)*')
+
 
 class HabitProfiler:
     """Interactive questionnaire to build user behavioral profile"""
@@ -170,14 +182,14 @@ class HabitProfiler:
     def _ask_int(self, question: str, min_val: int, max_val: int) -> int:
         """Ask for an integer within range"""
         while True:
-            try:
-                answer = input(f"\n{question} [{min_val}-{max_val}]\n> ").strip()
-                value = int(answer)
-                if min_val <= value <= max_val:
-                    return value
-                print(f"  ⚠️  Please enter a number between {min_val} and {max_val}")
-            except ValueError:
+            answer = input(f"\n{question} [{min_val}-{max_val}]\n> ").strip()
+            if not _INT_RE.fullmatch(answer):
                 print(f"  ⚠️  Please enter a valid number")
+                continue
+            value = int(answer)
+            if min_val <= value <= max_val:
+                return value
+            print(f"  ⚠️  Please enter a number between {min_val} and {max_val}")
     
     def _ask_time(self, question: str) -> str:
         """Ask for time in HH:MM format"""
@@ -201,15 +213,15 @@ class HabitProfiler:
             print(f"  {i}. {choice}")
         
         while True:
-            try:
-                answer = input("> ").strip()
-                idx = int(answer) - 1
-                if 0 <= idx < len(choices):
-                    # Clean up the choice (remove parenthetical explanations)
-                    return choices[idx].split(' (')[0]
-                print(f"  ⚠️  Please enter a number between 1 and {len(choices)}")
-            except ValueError:
+            answer = input("> ").strip()
+            if not _INT_RE.fullmatch(answer):
                 print(f"  ⚠️  Please enter a valid number")
+                continue
+            idx = int(answer) - 1
+            if 0 <= idx < len(choices):
+                # Clean up the choice (remove parenthetical explanations)
+                return choices[idx].split(' (')[0]
+            print(f"  ⚠️  Please enter a number between 1 and {len(choices)}")
     
     def _ask_multiple_choice(self, choices: List[str]) -> List[str]:
         """Ask user to pick multiple options"""
@@ -221,14 +233,14 @@ class HabitProfiler:
             if answer.lower() == 'none':
                 return []
             
-            try:
-                indices = [int(x.strip()) - 1 for x in answer.split(',')]
-                if all(0 <= idx < len(choices) for idx in indices):
-                    # Clean up choices
-                    return [choices[idx].split(' (')[0] for idx in indices]
-                print(f"  ⚠️  Please enter numbers between 1 and {len(choices)}")
-            except ValueError:
+            if not _MULTI_RE.fullmatch(answer):
                 print(f"  ⚠️  Please enter valid numbers separated by commas")
+                continue
+            indices = [int(x) - 1 for x in answer.split(',')]
+            if all(0 <= idx < len(choices) for idx in indices):
+                # Clean up choices
+                return [choices[idx].split(' (')[0] for idx in indices]
+            print(f"  ⚠️  Please enter numbers between 1 and {len(choices)}")
     
     def _ask_yes_no(self, question: str) -> bool:
         """Ask a yes/no question"""
@@ -246,6 +258,10 @@ class HabitProfiler:
         filename = f"{name_clean}.json"
         filepath = self.profiles_dir / filename
         
+        if orjson is not None:
+            filepath.write_bytes(orjson.dumps(profile.model_dump(), option=orjson.OPT_INDENT_2))
+            return
+        
         with open(filepath, 'w') as f:
             json.dump(profile.model_dump(mode='json'), f, indent=2, default=str)
     
@@ -260,8 +276,11 @@ class HabitProfiler:
         if not filepath.exists():
             raise FileNotFoundError(f"Profile not found: {filepath}")
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(filepath.read_bytes())
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
         
         return UserProfile(**data)
 
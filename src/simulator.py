@@ -3,252 +3,134 @@
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Tuple
-from src.models import UserProfile, SimulatedDay
+from src.models import UserProfile, DAYS_OF_WEEK
 from src.profiler import HabitProfiler
+from src._jit import njit
 import json
 
 
-class BehaviorSimulator:
-    """Simulates user behavior based on their profile"""
+# Per-weekday context parameters, indexed by datetime.weekday() (0 = monday)
+_STRESS_MEAN_BY_DOW = np.array([6, 6, 6, 6, 5, 4, 4], dtype=float)  # weekdays more stressful
+_SOCIAL_PROB_BY_DOW = np.array([0.15, 0.15, 0.15, 0.15, 0.4, 0.4, 0.3])  # more likely on weekends
+_WORK_MEAN_BY_DOW = np.array([6, 6, 6, 6, 6, 3, 3], dtype=float)
+_WORK_STD_BY_DOW = np.array([1.5, 1.5, 1.5, 1.5, 1.5, 1.0, 1.0])
+
+# Hours of day covered by each peak-energy period
+_PERIOD_HOURS = {
+    'morning': range(6, 12),
+    'afternoon': range(12, 17),
+    'evening': range(17, 22),
+    'night': [22, 23, 0, 1, 2, 3, 4, 5],
+}
+
+# How strongly high stress raises difficulty, by profile stress_response
+# (power_through types aren't affected as much)
+_STRESS_IMPACT = {'shutdown': 0.5, 'adaptive': 0.2}
+
+
+@njit(cache=True)
+def _simulate_kernel(
+    base_difficulty, sleep_quality, stress_level, social_obligations, work_intensity,
+    is_peak_time, motivation_noise, probability_noise, completion_draw,
+    stress_impact, social_trigger, work_trigger, distraction_prone,
+    comfort_with_difficulty, likes_milestones, proven_streak
+):
+    """
+    Day-by-day streak/motivation recurrence over pre-sampled arrays
     
-    def __init__(self, profile: UserProfile):
-        self.profile = profile
-        self.rng = np.random.RandomState(42)  # Reproducible randomness
-        
-        # Parse difficulty by day
-        self.day_difficulty = {
-            'monday': profile.monday_difficulty,
-            'tuesday': profile.tuesday_difficulty,
-            'wednesday': profile.wednesday_difficulty,
-            'thursday': profile.thursday_difficulty,
-            'friday': profile.friday_difficulty,
-            'saturday': profile.saturday_difficulty,
-            'sunday': profile.sunday_difficulty,
-        }
+    Returns (completed, difficulty, motivation, current_streak,
+    days_since_last, total_completions) arrays, the streak counters
+    being the values going into each day.
+    """
+    n = base_difficulty.shape[0]
+    completed = np.empty(n, dtype=np.bool_)
+    difficulty = np.empty(n)
+    motivation = np.empty(n)
+    streaks = np.empty(n, dtype=np.int64)
+    gaps = np.empty(n, dtype=np.int64)
+    totals = np.empty(n, dtype=np.int64)
     
-    def simulate_days(self, num_days: int = 90) -> pd.DataFrame:
-        """Simulate N days of behavior"""
-        print(f"\n🔮 Simulating {num_days} days of behavior for {self.profile.name}...")
-        
-        simulated_days = []
-        current_streak = 0
-        total_completions = 0
-        days_since_last = 0
-        
-        for day_num in range(num_days):
-            # Determine day of week
-            start_date = datetime.now()
-            current_date = start_date + timedelta(days=day_num)
-            day_of_week = current_date.strftime('%A').lower()
-            
-            # Simulate the day
-            sim_day = self._simulate_single_day(
-                day_num=day_num,
-                day_of_week=day_of_week,
-                current_streak=current_streak,
-                total_completions=total_completions,
-                days_since_last=days_since_last
-            )
-            
-            # Update tracking variables
-            if sim_day.completed:
-                current_streak += 1
-                total_completions += 1
-                days_since_last = 0
-            else:
-                current_streak = 0
-                days_since_last += 1
-            
-            simulated_days.append(sim_day)
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([day.model_dump() for day in simulated_days])
-        
-        print(f"  ✅ Generated {num_days} simulated days")
-        print(f"  📊 Success rate: {df['completed'].mean():.1%}")
-        print(f"  🔥 Max streak: {max(df['current_streak'])}")
-        print(f"  📉 Avg difficulty: {df['difficulty'].mean():.1f}/10")
-        
-        return df
+    current_streak = 0
+    total_completions = 0
+    days_since_last = 0
     
-    def _simulate_single_day(
-        self,
-        day_num: int,
-        day_of_week: str,
-        current_streak: int,
-        total_completions: int,
-        days_since_last: int
-    ) -> SimulatedDay:
-        """Simulate a single day of behavior"""
-        
-        # Base difficulty from profile
-        base_difficulty = self.day_difficulty[day_of_week]
-        
-        # Context factors (random with some patterns)
-        sleep_quality = self._sample_sleep_quality()
-        stress_level = self._sample_stress_level(day_of_week)
-        social_obligations = self._has_social_obligations(day_of_week)
-        work_intensity = self._sample_work_intensity(day_of_week)
-        
-        # Determine optimal time based on peak energy
-        time_attempted = self._select_attempt_time()
-        
-        # Calculate actual difficulty considering all factors
-        difficulty = self._calculate_difficulty(
-            base_difficulty=base_difficulty,
-            day_num=day_num,
-            current_streak=current_streak,
-            days_since_last=days_since_last,
-            sleep_quality=sleep_quality,
-            stress_level=stress_level,
-            social_obligations=social_obligations,
-            work_intensity=work_intensity,
-            time_attempted=time_attempted
-        )
-        
-        # Calculate motivation
-        motivation = self._calculate_motivation(
-            current_streak=current_streak,
-            days_since_last=days_since_last,
-            difficulty=difficulty,
-            total_completions=total_completions
-        )
+    for day_num in range(n):
+        streaks[day_num] = current_streak
+        gaps[day_num] = days_since_last
+        totals[day_num] = total_completions
         
-        # Determine if completed (probability based on difficulty and motivation)
-        completion_probability = self._calculate_completion_probability(
-            difficulty=difficulty,
-            motivation=motivation
-        )
-        completed = self.rng.random() < completion_probability
-        
-        return SimulatedDay(
-            day_number=day_num,
-            day_of_week=day_of_week,
-            time_attempted=time_attempted,
-            completed=completed,
-            difficulty=difficulty,
-            motivation=motivation,
-            sleep_quality=sleep_quality,
-            stress_level=stress_level,
-            social_obligations=social_obligations,
-            work_intensity=work_intensity,
-            days_since_last=days_since_last,
-            current_streak=current_streak,
-            total_completions=total_completions
-        )
-    
-    def _calculate_difficulty(
-        self,
-        base_difficulty: float,
-        day_num: int,
-        current_streak: int,
-        days_since_last: int,
-        sleep_quality: float,
-        stress_level: float,
-        social_obligations: bool,
-        work_intensity: float,
-        time_attempted: str
-    ) -> float:
-        """Calculate actual difficulty considering all factors"""
-        
-        difficulty = base_difficulty
+        # --- Difficulty, starting from the profile's rating for the weekday ---
+        d = base_difficulty[day_num]
         
         # Early days are harder (learning curve)
         if day_num < 14:
-            difficulty += (14 - day_num) * 0.2
+            d += (14 - day_num) * 0.2
         
         # Long streaks make it easier (momentum)
         if current_streak > 7:
-            difficulty -= min(2.0, current_streak * 0.1)
+            d -= min(2.0, current_streak * 0.1)
         
         # Gaps make it harder to restart
         if days_since_last > 3:
-            difficulty += min(3.0, days_since_last * 0.3)
+            d += min(3.0, days_since_last * 0.3)
         
         # Poor sleep makes it harder
-        if sleep_quality < 5:
-            difficulty += (5 - sleep_quality) * 0.3
+        if sleep_quality[day_num] < 5:
+            d += (5 - sleep_quality[day_num]) * 0.3
         
         # High stress impact based on profile
-        if stress_level > 6:
-            if self.profile.stress_response == "shutdown":
-                difficulty += (stress_level - 6) * 0.5
-            elif self.profile.stress_response == "adaptive":
-                difficulty += (stress_level - 6) * 0.2
-            # power_through types aren't affected as much
+        if stress_level[day_num] > 6:
+            d += (stress_level[day_num] - 6) * stress_impact
         
         # Social obligations
-        if social_obligations and "social_events" in self.profile.typical_failure_triggers:
-            difficulty += 1.5
+        if social_obligations[day_num] and social_trigger:
+            d += 1.5
         
         # High work intensity
-        if work_intensity > 7 and "work_stress" in self.profile.typical_failure_triggers:
-            difficulty += (work_intensity - 7) * 0.4
+        if work_intensity[day_num] > 7 and work_trigger:
+            d += (work_intensity[day_num] - 7) * 0.4
         
         # Time of day alignment with peak energy
-        is_peak_time = any(self._time_in_period(time_attempted, period) 
-                          for period in self.profile.peak_energy_times)
-        if not is_peak_time:
-            difficulty += 1.0
+        if not is_peak_time[day_num]:
+            d += 1.0
         
         # Distraction factor
-        difficulty += (self.profile.distraction_prone - 5) * 0.1
+        d += (distraction_prone - 5) * 0.1
         
-        # Clamp to 1-10 range
-        return max(1.0, min(10.0, difficulty))
-    
-    def _calculate_motivation(
-        self,
-        current_streak: int,
-        days_since_last: int,
-        difficulty: float,
-        total_completions: int
-    ) -> float:
-        """Calculate motivation level"""
-        
-        # Base motivation from comfort with difficulty
-        motivation = self.profile.comfort_with_difficulty
+        d = max(1.0, min(10.0, d))
+        
+        # --- Motivation, from comfort with difficulty ---
+        m = comfort_with_difficulty
         
         # Streaks are motivating
         if current_streak > 0:
-            motivation += min(3.0, current_streak * 0.2)
+            m += min(3.0, current_streak * 0.2)
         
         # Missing days is demotivating
         if days_since_last > 2:
-            motivation -= min(3.0, days_since_last * 0.3)
+            m -= min(3.0, days_since_last * 0.3)
         
         # Early progress is exciting
         if total_completions < 30:
-            motivation += 1.0
+            m += 1.0
         
         # Milestone effects (data-driven people love milestones)
-        if "seeing data/progress" in self.profile.motivation_style:
-            if current_streak in [7, 14, 21, 30, 60, 90]:
-                motivation += 2.0
+        if likes_milestones and (current_streak == 7 or current_streak == 14 or current_streak == 21
+                                 or current_streak == 30 or current_streak == 60 or current_streak == 90):
+            m += 2.0
         
         # If it seems too hard, motivation drops
-        if difficulty > 8:
-            motivation -= 1.5
+        if d > 8:
+            m -= 1.5
         
         # Add some randomness
-        motivation += self.rng.normal(0, 0.5)
+        m += motivation_noise[day_num]
+        m = max(1.0, min(10.0, m))
         
-        return max(1.0, min(10.0, motivation))
-    
-    def _calculate_completion_probability(
-        self,
-        difficulty: float,
-        motivation: float
-    ) -> float:
-        """Convert difficulty and motivation into completion probability"""
-        
-        # Higher motivation and lower difficulty = higher probability
-        # Use a sigmoid-like function
-        score = motivation - difficulty
-        
-        # Base probability from score
+        # --- Completion probability: higher motivation and lower difficulty ---
+        score = m - d
         if score >= 4:
             prob = 0.95
         elif score >= 2:
@@ -262,82 +144,159 @@ class BehaviorSimulator:
         else:
             prob = 0.15
         
-        # Past success matters
-        if self.profile.longest_streak > 30:
-            prob += 0.05  # They've proven they can do it
+        # Past success matters (they've proven they can do it)
+        if proven_streak:
+            prob += 0.05
         
         # Add some randomness (life happens)
-        prob += self.rng.normal(0, 0.05)
-        
-        return max(0.05, min(0.95, prob))
+        prob += probability_noise[day_num]
+        prob = max(0.05, min(0.95, prob))
+        
+        done = completion_draw[day_num] < prob
+        completed[day_num] = done
+        difficulty[day_num] = d
+        motivation[day_num] = m
+        
+        # Update tracking variables
+        if done:
+            current_streak += 1
+            total_completions += 1
+            days_since_last = 0
+        else:
+            current_streak = 0
+            days_since_last += 1
     
-    def _sample_sleep_quality(self) -> float:
-        """Sample sleep quality (1-10)"""
-        # Most people have decent sleep, but occasional bad nights
-        return np.clip(self.rng.normal(7, 1.5), 1, 10)
+    return completed, difficulty, motivation, streaks, gaps, totals
+
+
+class BehaviorSimulator:
+    """Simulates user behavior based on their profile"""
     
-    def _sample_stress_level(self, day_of_week: str) -> float:
-        """Sample stress level based on day"""
-        # Weekdays typically more stressful
-        if day_of_week in ['monday', 'tuesday', 'wednesday', 'thursday']:
-            base_stress = 6
-        elif day_of_week == 'friday':
-            base_stress = 5
-        else:  # weekend
-            base_stress = 4
-        
-        return np.clip(self.rng.normal(base_stress, 1.5), 1, 10)
+    def __init__(self, profile: UserProfile):
+        self.profile = profile
+        self.rng = np.random.default_rng(42)  # Reproducible randomness (PCG64)
+        
+        # Parse difficulty by day
+        self.day_difficulty = {
+            'monday': profile.monday_difficulty,
+            'tuesday': profile.tuesday_difficulty,
+            'wednesday': profile.wednesday_difficulty,
+            'thursday': profile.thursday_difficulty,
+            'friday': profile.friday_difficulty,
+            'saturday': profile.saturday_difficulty,
+            'sunday': profile.sunday_difficulty,
+        }
+        
+        # Hours that fall in any of the profile's peak energy periods
+        self._peak_hours = set()
+        for period in profile.peak_energy_times:
+            self._peak_hours.update(_PERIOD_HOURS.get(period.lower().split()[0], ()))
     
-    def _has_social_obligations(self, day_of_week: str) -> bool:
-        """Check if day has social obligations"""
-        # More likely on weekends
-        if day_of_week in ['friday', 'saturday']:
-            return self.rng.random() < 0.4
-        elif day_of_week == 'sunday':
-            return self.rng.random() < 0.3
-        else:
-            return self.rng.random() < 0.15
+    def simulate_days(self, num_days: int = 90) -> pd.DataFrame:
+        """Simulate N days of behavior"""
+        print(f"\n🔮 Simulating {num_days} days of behavior for {self.profile.name}...")
+        
+        # Day of week for each simulated day, starting today
+        dow = (datetime.now().weekday() + np.arange(num_days)) % 7
+        
+        # Context doesn't depend on past behavior, so draw it for all days at once
+        context = self._vectorized_context(dow)
+        
+        # Per-day noise for motivation, completion probability and the outcome
+        motivation_noise = self.rng.normal(0, 0.5, num_days)
+        probability_noise = self.rng.normal(0, 0.05, num_days)
+        completion_draw = self.rng.random(num_days)
+        
+        base_difficulty = np.array([self.day_difficulty[day] for day in DAYS_OF_WEEK], dtype=float)[dow]
+        profile = self.profile
+        completed, difficulty, motivation, streaks, gaps, totals = _simulate_kernel(
+            base_difficulty,
+            context['sleep_quality'],
+            context['stress_level'],
+            context['social_obligations'],
+            context['work_intensity'],
+            context['is_peak_time'],
+            motivation_noise,
+            probability_noise,
+            completion_draw,
+            _STRESS_IMPACT.get(profile.stress_response, 0.0),
+            "social_events" in profile.typical_failure_triggers,
+            "work_stress" in profile.typical_failure_triggers,
+            float(profile.distraction_prone),
+            float(profile.comfort_with_difficulty),
+            "seeing data/progress" in profile.motivation_style,
+            profile.longest_streak > 30
+        )
+        
+        # Build the DataFrame straight from the columns (SimulatedDay field order);
+        # use SimulatedDay.from_row when a model is needed for a single row
+        df = pd.DataFrame({
+            'day_number': np.arange(num_days),
+            'day_of_week': [DAYS_OF_WEEK[i] for i in dow],
+            'time_attempted': context['time_attempted'],
+            'completed': completed,
+            'difficulty': difficulty,
+            'motivation': motivation,
+            'sleep_quality': context['sleep_quality'],
+            'stress_level': context['stress_level'],
+            'social_obligations': context['social_obligations'],
+            'work_intensity': context['work_intensity'],
+            'days_since_last': gaps,
+            'current_streak': streaks,
+            'total_completions': totals,
+        })
+        
+        print(f"  ✅ Generated {num_days} simulated days")
+        print(f"  📊 Success rate: {df['completed'].mean():.1%}")
+        print(f"  🔥 Max streak: {max(df['current_streak'])}")
+        print(f"  📉 Avg difficulty: {df['difficulty'].mean():.1f}/10")
+        
+        return df
     
-    def _sample_work_intensity(self, day_of_week: str) -> float:
-        """Sample work intensity"""
-        if day_of_week in ['saturday', 'sunday']:
-            return np.clip(self.rng.normal(3, 1), 1, 10)
-        else:
-            return np.clip(self.rng.normal(6, 1.5), 1, 10)
+    def _vectorized_context(self, dow: np.ndarray) -> Dict[str, np.ndarray]:
+        """Sample the context factors for every day (dow = weekday index per day)"""
+        n = len(dow)
+        
+        # Most people have decent sleep, but occasional bad nights
+        sleep_quality = np.clip(self.rng.normal(7, 1.5, n), 1, 10)
+        stress_level = np.clip(self.rng.normal(_STRESS_MEAN_BY_DOW[dow], 1.5), 1, 10)
+        social_obligations = self.rng.random(n) < _SOCIAL_PROB_BY_DOW[dow]
+        work_intensity = np.clip(self.rng.normal(_WORK_MEAN_BY_DOW[dow], _WORK_STD_BY_DOW[dow]), 1, 10)
+        
+        # Attempt time drawn from the peak-energy slots
+        time_options = self._time_options()
+        option_is_peak = np.array([int(t[:2]) in self._peak_hours for t in time_options], dtype=bool)
+        choice = self.rng.integers(0, len(time_options), n)
+        time_attempted = [time_options[i] for i in choice]
+        
+        return {
+            'sleep_quality': sleep_quality,
+            'stress_level': stress_level,
+            'social_obligations': social_obligations,
+            'work_intensity': work_intensity,
+            'time_attempted': time_attempted,
+            'is_peak_time': option_is_peak[choice],
+        }
     
-    def _select_attempt_time(self) -> str:
-        """Select time to attempt habit based on peak energy"""
+    def _time_options(self) -> List[str]:
+        """Times to attempt the habit based on peak energy"""
         # Convert peak energy periods to specific times
         time_options = []
+        peak_periods = [p.split()[0] for p in self.profile.peak_energy_times]
         
-        if "morning" in [p.split()[0] for p in self.profile.peak_energy_times]:
+        if "morning" in peak_periods:
             time_options.extend(['07:00', '08:00', '09:00', '10:00'])
-        if "afternoon" in [p.split()[0] for p in self.profile.peak_energy_times]:
+        if "afternoon" in peak_periods:
             time_options.extend(['12:00', '13:00', '14:00', '15:00'])
-        if "evening" in [p.split()[0] for p in self.profile.peak_energy_times]:
+        if "evening" in peak_periods:
             time_options.extend(['17:00', '18:00', '19:00', '20:00'])
-        if "night" in [p.split()[0] for p in self.profile.peak_energy_times]:
+        if "night" in peak_periods:
             time_options.extend(['21:00', '22:00', '23:00'])
         
         if not time_options:
             time_options = ['09:00', '12:00', '18:00']
         
-        return self.rng.choice(time_options)
-    
-    def _time_in_period(self, time_str: str, period: str) -> bool:
-        """Check if time falls in period"""
-        hour = int(time_str.split(':')[0])
-        period_lower = period.lower().split()[0]
-        
-        if period_lower == "morning":
-            return 6 <= hour < 12
-        elif period_lower == "afternoon":
-            return 12 <= hour < 17
-        elif period_lower == "evening":
-            return 17 <= hour < 22
-        elif period_lower == "night":
-            return hour >= 22 or hour < 6
-        return False
+        return time_options
     
     def save_synthetic_data(self, df: pd.DataFrame, filename: str = None):
         """Save synthetic data to CSV"""